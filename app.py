@@ -1,9 +1,16 @@
-from flask import Flask, request, jsonify, render_template_string
+from flask import Flask, Response, request, jsonify, render_template_string
 from flask_cors import CORS
 import os
 import sys
+import json
+import hashlib
 from datetime import datetime
+from functools import lru_cache
 from search_engine import MinimalBlogSearchEngine
+try:
+    import orjson
+except ImportError:
+    orjson = None  # optional fast encoder, stdlib json otherwise
 app = Flask(__name__)
 CORS(app)  # Enable CORS for frontend requests
 
@@ -11,9 +18,16 @@ CORS(app)  # Enable CORS for frontend requests
 MODEL_PATH = "model/gensim-t4d-word2Vec.model"
 BLOG_DIR = "blogs/tech4dev_blogs"
 
+def env_flag(name):
+    """True when the environment variable is set to 1/true/yes"""
+    return os.environ.get(name, '').strip().lower() in ('1', 'true', 'yes')
+
 # Global search engine instance
 search_engine = None
 
+# Encoded bodies of the responses that only change with the engine (/suggest, /stats)
+_response_cache = {}
+
 def initialize_search_engine():
     """Initialize the search engine"""
     global search_engine
@@ -26,22 +40,82 @@ def initialize_search_engine():
             print(f"❌ Blog directory not found: {BLOG_DIR}")
             return False
         
-        search_engine = MinimalBlogSearchEngine(MODEL_PATH, BLOG_DIR)
+        search_engine = MinimalBlogSearchEngine(
+            MODEL_PATH, BLOG_DIR,
+            use_simsimd=env_flag('SEARCH_USE_SIMSIMD'),  # needs the 'simd' dependency group
+            quantize=env_flag('SEARCH_QUANTIZE')  # int8 rows scored by simsimd, also needs 'simd'
+        )
+        _cached_search.cache_clear()  # results from a previous engine are stale
+        _response_cache.clear()
         return True
     except Exception as e:
         print(f"❌ Failed to initialize search engine: {e}")
         return False
 
-# Routes
-@app.route('/')
-def index():
-    """Serve the main search interface"""
-    # You can serve the HTML file directly or use render_template
+def create_app():
+    """App factory for WSGI servers, e.g. gunicorn 'app:create_app()'"""
+    if search_engine is None and not initialize_search_engine():
+        raise RuntimeError("Failed to initialize search engine")
+    return app
+
+def encode_json(payload):
+    # sorted keys, same as Flask's jsonify
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_SORT_KEYS)
+    return json.dumps(payload, sort_keys=True).encode('utf-8')
+
+def json_response(payload):
+    """Like jsonify, but encoded with orjson when it is installed"""
+    return Response(encode_json(payload), mimetype='application/json')
+
+def cached_json_response(cache_key, build_payload):
+    """
+    JSON response whose body is built and encoded once per engine, with an ETag so
+    clients polling with If-None-Match get a 304 and no body
+    """
+    body = _response_cache.get(cache_key)
+    if body is None:
+        body = _response_cache[cache_key] = encode_json(build_payload())
+    response = Response(body, mimetype='application/json')
+    response.set_etag(hashlib.sha1(body).hexdigest())
+    return response.make_conditional(request)
+
+def normalize_query(query):
+    """Lowercase, strip and collapse whitespace so equivalent queries share a cache entry"""
+    return ' '.join(query.lower().split())
+
+# Upper bound on queries per /search_batch request
+MAX_BATCH_SIZE = 100
+
+@lru_cache(maxsize=1024)
+def _cached_search(normalized_query, top_k):
+    """Search and format results for JSON, memoized per (query, top_k)"""
+    return format_results(search_engine.search(normalized_query, top_k=top_k))
+
+def format_results(results):
+    """Format search results for the JSON response"""
+    return tuple(
+        (
+            blog_file,
+            float(score),  # Ensure JSON serializable
+            {
+                'title': metadata.get('title', 'Untitled'),
+                'author': metadata.get('author', 'Unknown'),
+                'category': metadata.get('category', 'General'),
+                'url': metadata.get('url', ''),
+                'content_preview': metadata.get('content_preview', 'No preview available')
+            }
+        )
+        for blog_file, score, metadata in results
+    )
+
+def load_frontend_html():
+    """Read the frontend once at import, it is static for the lifetime of the process"""
     try:
-        with open('blog_search_frontend.html', 'r') as f:
+        with open('blog_search_frontend.html', 'rb') as f:
             return f.read()
     except FileNotFoundError:
-        return """
+        return b"""
         <h1>Blog Search Engine</h1>
         <p>Frontend HTML file not found. Please save the HTML content to 'blog_search_frontend.html'</p>
         <p>Or use the API directly:</p>
@@ -52,6 +126,17 @@ def index():
         </ul>
         """
 
+INDEX_HTML = load_frontend_html()
+INDEX_HTML_ETAG = hashlib.md5(INDEX_HTML).hexdigest()
+
+# Routes
+@app.route('/')
+def index():
+    """Serve the main search interface from memory (restart the server to pick up HTML edits)"""
+    response = Response(INDEX_HTML, mimetype='text/html')
+    response.set_etag(INDEX_HTML_ETAG)
+    return response.make_conditional(request)
+
 @app.route('/search', methods=['POST'])
 def search_blogs():
     """Search endpoint for the frontend"""
@@ -75,23 +160,8 @@ def search_blogs():
         
         print(f"🔍 Searching for: '{query}'")
         
-        # Perform search
-        results = search_engine.search(query, top_k=top_k)
-        
-        # Format results for JSON response
-        formatted_results = []
-        for blog_file, score, metadata in results:
-            formatted_results.append([
-                blog_file,
-                float(score),  # Ensure JSON serializable
-                {
-                    'title': metadata.get('title', 'Untitled'),
-                    'author': metadata.get('author', 'Unknown'),
-                    'category': metadata.get('category', 'General'),
-                    'url': metadata.get('url', ''),
-                    'content_preview': metadata.get('content_preview', 'No preview available')
-                }
-            ])
+        # Perform search (repeat queries are served from the LRU cache)
+        formatted_results = _cached_search(normalize_query(query), top_k)
         
         return jsonify({
             'query': query,
@@ -107,10 +177,56 @@ def search_blogs():
             'message': str(e)
         }), 500
 
+@app.route('/search_batch', methods=['POST'])
+def search_blogs_batch():
+    """Search several queries in one request, scored together in a single matrix product"""
+    if not search_engine:
+        return jsonify({
+            'error': 'Search engine not initialized',
+            'message': 'Please check server logs for initialization errors'
+        }), 500
+    
+    try:
+        data = request.get_json()
+        
+        if not data or 'queries' not in data:
+            return jsonify({'error': 'Missing queries parameter'}), 400
+        
+        queries = data['queries']
+        top_k = data.get('top_k', 5)
+        
+        if not isinstance(queries, list) or not all(isinstance(q, str) and q.strip() for q in queries):
+            return jsonify({'error': 'queries must be a list of non-empty strings'}), 400
+        if not queries or len(queries) > MAX_BATCH_SIZE:
+            return jsonify({'error': f'Batch must contain between 1 and {MAX_BATCH_SIZE} queries'}), 400
+        
+        print(f"🔍 Batch searching {len(queries)} queries")
+        
+        batch_results = search_engine.batch_search([normalize_query(q) for q in queries], top_k=top_k)
+        
+        return jsonify({
+            'results': [
+                {
+                    'query': query,
+                    'results': format_results(results),
+                    'total_found': len(results)
+                }
+                for query, results in zip(queries, batch_results)
+            ],
+            'timestamp': datetime.now().isoformat()
+        })
+        
+    except Exception as e:
+        print(f"❌ Batch search error: {e}")
+        return jsonify({
+            'error': 'Search failed',
+            'message': str(e)
+        }), 500
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({
+    return json_response({
         'status': 'healthy' if search_engine else 'unhealthy',
         'search_engine_loaded': search_engine is not None,
         'blog_count': len(search_engine.blog_metadata) if search_engine else 0,
@@ -124,10 +240,10 @@ def get_stats():
     if not search_engine:
         return jsonify({'error': 'Search engine not initialized'}), 500
     
-    return jsonify({
+    return cached_json_response('stats', lambda: {
         'blog_count': len(search_engine.blog_metadata),
         'vocabulary_size': len(search_engine.model.wv.key_to_index),
-        'indexed_words': len(search_engine.doc_embeddings.items()),
+        'indexed_words': search_engine.get_stats()['total_blogs'],
         'sample_vocabulary': list(search_engine.get_vocabulary_sample())[:20],
         'sample_blogs': list(search_engine.blog_metadata.keys())[:10]
     })
@@ -138,18 +254,10 @@ def get_suggestions():
     if not search_engine:
         return jsonify([])
     
-    # Return some common words from vocabulary as suggestions
-    vocab = list(search_engine.model.wv.key_to_index.keys())
-    
-    # Filter for meaningful words (longer than 4 characters)
-    meaningful_words = [word for word in vocab if len(word) > 4 and word.isalpha()]
-    
-    # Return top 20 as suggestions
-    suggestions = meaningful_words[:20]
-    
-    return jsonify({
-        'suggestions': suggestions,
-        'total_vocabulary': len(vocab)
+    # Common words from the vocabulary, precomputed when the engine loads
+    return cached_json_response('suggest', lambda: {
+        'suggestions': search_engine.get_suggestions(),
+        'total_vocabulary': search_engine.vocab_size
     })
 
 # Error handlers
@@ -1,23 +1,95 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
 from bs4 import BeautifulSoup
+from lxml import etree
 import os
+import json
 import time
 import re
 from urllib.parse import urljoin, urlparse
 import logging
+import threading
+import queue
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+def _has_class(name):
+    """XPath predicate matching one class among the space separated class attribute"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+# Compiled once, used on the lxml elements of every listing page
+BLOG_ITEMS_XPATH = etree.XPath(f".//div[{_has_class('e-loop-item')}]")
+LINK_DIV_XPATH = etree.XPath(".//div[@data-ha-element-link]")
+TITLE_XPATH = etree.XPath(f".//h3[{_has_class('elementor-heading-title')}]")
+CATEGORY_XPATH = etree.XPath(f".//span[{_has_class('elementor-post-info__terms-list-item')}]")
+AUTHOR_XPATH = etree.XPath(f".//span[{_has_class('elementor-post-info__item--type-author')}]")
+DATE_XPATH = etree.XPath(f".//span[{_has_class('elementor-post-info__item--type-date')}]")
+CURRENT_PAGE_XPATH = etree.XPath(f".//span[{_has_class('current')}]")
+
+# Regexes used per blog, compiled once
+HTML_TAG_RE = re.compile(r'<[^>]+>')
+INVALID_FILENAME_CHARS_RE = re.compile(r'[<>:"/\\|?*]')
+# one alternation so the body fallback strips all non-content elements in a single tree walk
+NON_CONTENT_CLASS_RE = re.compile('|'.join(['elementor-nav-menu', 'elementor-button', 'pagination', 'sidebar', 'widget']))
+
+# The only field needed from the data-ha-element-link JSON blob
+LINK_URL_RE = re.compile(r'"url"\s*:\s*"([^"]+)"')
+
+def _link_url(link_data):
+    """URL from a data-ha-element-link attribute, without parsing the whole JSON blob"""
+    match = LINK_URL_RE.search(link_data)
+    if match:
+        return match.group(1).replace('\\/', '/')
+    # unusual formatting, fall back to a real JSON parse
+    try:
+        return json.loads(link_data).get('url')
+    except (json.JSONDecodeError, AttributeError) as e:
+        logger.warning(f"Could not parse link data: {e}")
+        return None
+
+def _element_text(element):
+    """Stripped text of an lxml element, same as BeautifulSoup's get_text(strip=True)"""
+    return ''.join(text.strip() for text in element.itertext())
+
+class RateLimiter:
+    """Spaces calls out to at most `rate` per second, shared by all fetch threads"""
+    def __init__(self, rate):
+        self.interval = 1.0 / rate
+        self.lock = threading.Lock()
+        self.next_slot = time.monotonic()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next_slot - now
+            self.next_slot = max(now, self.next_slot) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
 class BlogScraper:
-    def __init__(self, base_url="https://projecttech4dev.org/blogs/", max_pages=45):
+    def __init__(self, base_url="https://projecttech4dev.org/blogs/", max_pages=45, max_workers=8, requests_per_second=5):
         self.base_url = base_url
         self.max_pages = max_pages
+        self.max_workers = max_workers
+        self.rate_limiter = RateLimiter(requests_per_second)
+        # set by scrape_blogs once the last listing page is found, stops the prefetching of further pages
+        self._listing_done = threading.Event()
+        # requests.Session is safe to share between threads for plain GETs and pools the connections
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
+        # Retry transient failures with exponential backoff (1s, 2s, 4s) on pooled keep-alive connections
+        retry = Retry(total=3, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504], allowed_methods=["GET"])
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=16, pool_maxsize=16)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         
         # Create directory for blog files
         self.output_dir = "tech4dev_blogs"
@@ -28,85 +100,83 @@ class BlogScraper:
     def clean_filename(self, title):
         """Clean title to make it a valid filename"""
         # Remove HTML tags if any
-        title = re.sub(r'<[^>]+>', '', title)
+        title = HTML_TAG_RE.sub('', title)
         # Replace invalid characters
-        title = re.sub(r'[<>:"/\\|?*]', '_', title)
+        title = INVALID_FILENAME_CHARS_RE.sub('_', title)
         # Remove extra whitespace and limit length
         title = ' '.join(title.split())
         title = title[:100]  # Limit to 100 characters
         return title.strip()
 
-    def get_page_content(self, url):
-        """Get page content with retry logic"""
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                response = self.session.get(url, timeout=30)
-                response.raise_for_status()
-                return response
-            except requests.RequestException as e:
-                logger.warning(f"Attempt {attempt + 1} failed for {url}: {str(e)}")
-                if attempt < max_retries - 1:
-                    time.sleep(2 ** attempt)  # Exponential backoff
-                else:
-                    logger.error(f"Failed to fetch {url} after {max_retries} attempts")
-                    return None
+    def get_page_content(self, url, stream=False, cancel_event=None):
+        """
+        Get page content, retries with exponential backoff are done by the session's adapter.
+        Once cancel_event is set the request is skipped (or its failure only logged at debug level)
+        """
+        try:
+            self.rate_limiter.wait()  # be respectful to the server
+            if cancel_event is not None and cancel_event.is_set():
+                return None
+            response = self.session.get(url, timeout=30, stream=stream)
+            response.raise_for_status()
+            return response
+        except requests.RequestException as e:
+            if cancel_event is not None and cancel_event.is_set():
+                logger.debug(f"Failed to fetch {url} after it was no longer needed: {str(e)}")
+            else:
+                logger.error(f"Failed to fetch {url}: {str(e)}")
+            return None
 
-    def extract_blog_links_from_page(self, soup, base_url):
-        """Extract blog post links from the current page using the actual HTML structure"""
+    def extract_blog_links_from_page(self, loop_container, base_url):
+        """Extract blog post links from the page's elementor-loop-container (an lxml element)"""
         blog_links = []
         
-        # Look for the loop container that contains all blog items
-        loop_container = soup.find('div', class_='elementor-loop-container')
-        if not loop_container:
+        # The loop container holds all blog items
+        if loop_container is None:
             logger.warning("Could not find elementor-loop-container")
             return blog_links
         
         # Find all blog items within the loop container
-        blog_items = loop_container.find_all('div', class_='e-loop-item')
+        blog_items = BLOG_ITEMS_XPATH(loop_container)
         
         for item in blog_items:
             # Look for the clickable container with data-ha-element-link attribute
-            clickable_div = item.find('div', {'data-ha-element-link': True})
-            if clickable_div:
-                # Extract URL from the data attribute
-                link_data = clickable_div.get('data-ha-element-link')
-                if link_data:
-                    # Parse the JSON-like data to extract URL
-                    try:
-                        import json
-                        link_info = json.loads(link_data.replace("\\", ""))
-                        blog_url = link_info.get('url')
-                        
-                        if blog_url:
-                            # Find the title within the heading element
-                            title_element = item.find('h3', class_='elementor-heading-title')
-                            if title_element:
-                                title = title_element.get_text(strip=True)
-                                
-                                # Find the category for additional context
-                                category_element = item.find('span', class_='elementor-post-info__terms-list-item')
-                                category = category_element.get_text(strip=True) if category_element else "Unknown"
-                                
-                                # Find the author and date
-                                author_element = item.find('span', class_='elementor-post-info__item--type-author')
-                                author = author_element.get_text(strip=True) if author_element else "Unknown"
-                                
-                                date_element = item.find('span', class_='elementor-post-info__item--type-date')
-                                date = date_element.get_text(strip=True) if date_element else "Unknown"
-                                
-                                blog_links.append({
-                                    'url': blog_url,
-                                    'title': title,
-                                    'category': category,
-                                    'author': author,
-                                    'date': date
-                                })
-                                
-                                logger.debug(f"Found blog: {title} by {author} in {category}")
-                    except (json.JSONDecodeError, KeyError) as e:
-                        logger.warning(f"Could not parse link data: {e}")
-                        continue
+            clickable_divs = LINK_DIV_XPATH(item)
+            if not clickable_divs:
+                continue
+            
+            # Extract URL from the data attribute
+            link_data = clickable_divs[0].get('data-ha-element-link')
+            blog_url = _link_url(link_data) if link_data else None
+            if not blog_url:
+                continue
+            
+            # Find the title within the heading element
+            title_elements = TITLE_XPATH(item)
+            if not title_elements:
+                continue
+            title = _element_text(title_elements[0])
+            
+            # Find the category for additional context
+            category_elements = CATEGORY_XPATH(item)
+            category = _element_text(category_elements[0]) if category_elements else "Unknown"
+            
+            # Find the author and date
+            author_elements = AUTHOR_XPATH(item)
+            author = _element_text(author_elements[0]) if author_elements else "Unknown"
+            
+            date_elements = DATE_XPATH(item)
+            date = _element_text(date_elements[0]) if date_elements else "Unknown"
+            
+            blog_links.append({
+                'url': blog_url,
+                'title': title,
+                'category': category,
+                'author': author,
+                'date': date
+            })
+            
+            logger.debug(f"Found blog: {title} by {author} in {category}")
         
         logger.info(f"Extracted {len(blog_links)} blog links from current page")
         return blog_links
@@ -117,7 +187,8 @@ class BlogScraper:
         if not response:
             return None
             
-        soup = BeautifulSoup(response.content, 'html.parser')
+        # The body fallback below needs the whole document, so no strainer here
+        soup = BeautifulSoup(response.content, 'lxml')
         
         # Remove unwanted elements
         for element in soup(['script', 'style', 'nav', 'footer', 'header', 'aside', 'iframe']):
@@ -155,9 +226,8 @@ class BlogScraper:
             body = soup.find('body')
             if body:
                 # Remove common non-content elements
-                for remove_class in ['elementor-nav-menu', 'elementor-button', 'pagination', 'sidebar', 'widget']:
-                    for elem in body.find_all(class_=re.compile(remove_class)):
-                        elem.decompose()
+                for elem in body.find_all(class_=NON_CONTENT_CLASS_RE):
+                    elem.decompose()
                 
                 content = body.get_text(separator='\n', strip=True)
                 
@@ -205,6 +275,57 @@ class BlogScraper:
             logger.error(f"Failed to save {filename}: {str(e)}")
             return False
 
+    def _writer_loop(self):
+        """Save queued (blog_data, content) items until the None sentinel arrives"""
+        while True:
+            item = self._write_queue.get()
+            if item is None:
+                return
+            blog_data, content = item
+            # only this thread writes, so the duplicate filename check can't race
+            if self.save_blog_content(blog_data, content):
+                self._saved_count += 1
+            else:
+                logger.warning(f"Failed to save: {blog_data['title']}")
+
+    def _fetch_listing_page(self, page_url):
+        """
+        Stream one listing page through lxml's incremental parser.
+        Reading stops as soon as the blog grid is complete, the rest of the page is never downloaded.
+        Returns (loop_container, pagination) lxml elements (either may be None), or None if the fetch failed
+        """
+        if self._listing_done.is_set():
+            return None
+        logger.info(f"Fetching page: {page_url}")
+        response = self.get_page_content(page_url, stream=True, cancel_event=self._listing_done)
+        if not response:
+            return None
+        
+        loop_container = pagination = None
+        try:
+            response.raw.decode_content = True  # let urllib3 undo gzip/deflate
+            for _, element in etree.iterparse(response.raw, events=('end',), tag=('div', 'nav'), html=True):
+                classes = (element.get('class') or '').split()
+                if element.tag == 'div' and 'elementor-loop-container' in classes:
+                    loop_container = element
+                    # pagination is only needed to detect the end when the grid is empty
+                    if BLOG_ITEMS_XPATH(element):
+                        break
+                elif element.tag == 'nav' and 'elementor-pagination' in classes:
+                    pagination = element
+                    if loop_container is not None:
+                        break
+        except etree.XMLSyntaxError as e:
+            logger.warning(f"Could not parse {page_url}: {str(e)}")
+        except (requests.RequestException, Urllib3HTTPError) as e:
+            # the body is read from response.raw, so a dropped connection surfaces as a urllib3 error
+            # (ProtocolError, ReadTimeoutError) that the session's Retry adapter doesn't retry
+            logger.warning(f"Connection lost while reading {page_url}: {str(e)}")
+            return None
+        finally:
+            response.close()
+        return loop_container, pagination
+
     def scrape_blogs(self):
         """Main method to scrape all blog posts"""
         logger.info(f"Starting to scrape blogs from {self.base_url}")
@@ -213,45 +334,51 @@ class BlogScraper:
         total_downloaded = 0
         all_blog_links = []
         
-        # First, collect all blog links from all pages
-        for page_num in range(1, self.max_pages + 1):
-            if page_num == 1:
-                page_url = self.base_url
-            else:
-                # Based on the HTML structure, pagination uses /page/N/ format
-                page_url = f"{self.base_url}page/{page_num}/"
-            
-            logger.info(f"Fetching page {page_num}: {page_url}")
-            
-            response = self.get_page_content(page_url)
-            if not response:
-                logger.error(f"Failed to fetch page {page_num}")
-                continue
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract blog links from this page
-            blog_links = self.extract_blog_links_from_page(soup, page_url)
-            
-            if not blog_links:
-                logger.info(f"No blog links found on page {page_num}")
-                # Check if we've reached the end by looking for pagination
-                pagination = soup.find('nav', class_='elementor-pagination')
-                if pagination:
-                    current_page = pagination.find('span', class_='current')
-                    if current_page and str(page_num) in current_page.get_text():
-                        # We're on a valid page but no content found
-                        logger.info(f"Reached end of content at page {page_num}")
+        # Based on the HTML structure, pagination uses /page/N/ format
+        page_urls = [self.base_url if page_num == 1 else f"{self.base_url}page/{page_num}/"
+                     for page_num in range(1, self.max_pages + 1)]
+        
+        # First, collect all blog links from all pages. Pages are fetched concurrently
+        # (throttled by the rate limiter) and consumed in order so the end-of-content check still works.
+        # Only max_workers pages are in flight ahead of the one being consumed, and once the end is
+        # reached the ones still waiting on the rate limiter are skipped.
+        self._listing_done = threading.Event()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = deque()
+            next_page = 0
+            for page_num in range(1, self.max_pages + 1):
+                while next_page < len(page_urls) and len(pending) < self.max_workers:
+                    pending.append(executor.submit(self._fetch_listing_page, page_urls[next_page]))
+                    next_page += 1
+                listing = pending.popleft().result()
+                if listing is None:
+                    logger.error(f"Failed to fetch page {page_num}")
+                    continue
+                loop_container, pagination = listing
+                
+                # Extract blog links from this page
+                blog_links = self.extract_blog_links_from_page(loop_container, page_urls[page_num - 1])
+                
+                if not blog_links:
+                    logger.info(f"No blog links found on page {page_num}")
+                    # Check if we've reached the end by looking for pagination
+                    reached_end = False
+                    if pagination is not None:
+                        current_page = CURRENT_PAGE_XPATH(pagination)
+                        if current_page and str(page_num) in _element_text(current_page[0]):
+                            # We're on a valid page but no content found
+                            logger.info(f"Reached end of content at page {page_num}")
+                            reached_end = True
+                    else:
+                        logger.info(f"No pagination found, assuming end of content at page {page_num}")
+                        reached_end = True
+                    if reached_end:
+                        # don't fetch pages past the end
+                        self._listing_done.set()
                         break
-                else:
-                    logger.info(f"No pagination found, assuming end of content at page {page_num}")
-                    break
-            
-            all_blog_links.extend(blog_links)
-            logger.info(f"Found {len(blog_links)} blog links on page {page_num} (Total so far: {len(all_blog_links)})")
-            
-            # Add delay between page requests
-            time.sleep(2)
+                
+                all_blog_links.extend(blog_links)
+                logger.info(f"Found {len(blog_links)} blog links on page {page_num} (Total so far: {len(all_blog_links)})")
         
         # Remove duplicates from all collected links
         seen_urls = set()
@@ -263,24 +390,27 @@ class BlogScraper:
         
         logger.info(f"Total unique blog posts found: {len(unique_blog_links)}")
         
-        # Now download content for each blog post
-        for i, blog_data in enumerate(unique_blog_links, 1):
-            url = blog_data['url']
-            title = blog_data['title']
-            
-            logger.info(f"Processing blog {i}/{len(unique_blog_links)}: {title}")
-            
-            content = self.extract_blog_content(url, title)
-            if content:
-                if self.save_blog_content(blog_data, content):
-                    total_downloaded += 1
-                else:
-                    logger.warning(f"Failed to save: {title}")
-            else:
-                logger.warning(f"Could not extract content from: {url}")
-            
-            # Add delay between requests to be respectful
-            time.sleep(3)
+        # Now download content for each blog post concurrently. Finished posts are handed to
+        # a single writer thread so disk writes overlap with the fetching
+        self._write_queue = queue.Queue(maxsize=64)
+        self._saved_count = 0
+        writer = threading.Thread(target=self._writer_loop, daemon=True)
+        writer.start()
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                contents = executor.map(lambda blog: self.extract_blog_content(blog['url'], blog['title']), unique_blog_links)
+                for i, (blog_data, content) in enumerate(zip(unique_blog_links, contents), 1):
+                    logger.info(f"Processing blog {i}/{len(unique_blog_links)}: {blog_data['title']}")
+                    
+                    if content:
+                        self._write_queue.put((blog_data, content))
+                    else:
+                        logger.warning(f"Could not extract content from: {blog_data['url']}")
+        finally:
+            # let the writer finish everything queued, then stop it
+            self._write_queue.put(None)
+            writer.join()
+        total_downloaded = self._saved_count
         
         logger.info(f"Scraping completed! Downloaded {total_downloaded} blog posts to '{self.output_dir}' directory")
         return total_downloaded
@@ -0,0 +1,20 @@
+"""Gunicorn settings for serving the search API: gunicorn -c gunicorn.conf.py"""
+import multiprocessing
+import os
+
+# Search is BLAS bound, one BLAS thread per worker avoids oversubscribing the cores.
+# Has to be set here, before the master imports numpy while preloading the app.
+for var in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS'):
+    os.environ.setdefault(var, '1')
+
+wsgi_app = 'app:create_app()'
+# PaaS platforms running the Procfile assign the port through $PORT
+bind = os.environ.get('BIND') or f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+# sync workers: the hot path is compute bound, so gevent/eventlet would not help
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+worker_class = 'sync'
+
+# build the search engine once in the master, workers share its memory copy-on-write
+preload_app = True
+timeout = 120
@@ -1,117 +1,494 @@
 import os
 import re
+import math
+import hashlib
+import multiprocessing
+import json
+from functools import lru_cache, partial
+from itertools import islice
 from collections import defaultdict
 import numpy as np
 from gensim.models import Word2Vec
-from gensim.utils import simple_preprocess
 import logging
+try:
+    import simsimd
+except ImportError:
+    simsimd=None # optional SIMD kernels for use_simsimd/quantize, plain numpy matvec otherwise
+try:
+    import faiss
+except ImportError:
+    faiss=None # optional ANN index, exhaustive scoring otherwise
+try:
+    import hnswlib
+except ImportError:
+    hnswlib=None # alternative ANN index when faiss isn't installed
 logging.basicConfig(format='%(asctime)s : %(levelname)s : %(message)s', level=logging.INFO)
 
+def _l2(v):
+    """L2 norm of a vector, np.linalg.norm's ord/axis handling costs more than the math for D~300"""
+    return math.sqrt(float(np.vdot(v, v)))
+
+def _aligned_empty(shape, dtype, alignment=64):
+    """C-contiguous np.empty whose data starts on an alignment byte boundary (a cache line by default)"""
+    dtype=np.dtype(dtype)
+    nbytes=int(np.prod(shape))*dtype.itemsize
+    buf=np.empty(nbytes+alignment, dtype=np.uint8)
+    offset=-buf.ctypes.data%alignment
+    return buf[offset:offset+nbytes].view(dtype).reshape(shape)
+
+def clean_text(text):
+    """Same tokens as simple_preprocess(text, min_len=3, max_len=50), in one precompiled regex pass"""
+    return _TOKEN_RE.findall(text.lower())
+
+# gensim's tokens (runs of letters and underscores, i.e. word characters but digits) of 3 to 50 characters
+# that don't start with an underscore; longer runs are dropped, not split, so the match must span the whole run
+_TOKEN_RE=re.compile(r'(?<![^\W\d])[^\W\d_][^\W\d]{2,49}(?![^\W\d])')
+
+# "Key: value" metadata lines of a blog file's header, and the === line that ends it
+_HEADER_RE=re.compile(r'^(Title|Author|Category|URL): (.*)$', re.MULTILINE)
+_HEADER_END_RE=re.compile(r'^===.*\n?', re.MULTILINE)
+
+# Below this many blogs one BLAS matvec is exact and still faster than walking an HNSW graph
+ANN_MIN_DOCS=2000
+
+# Distinct queries whose embeddings are kept, 1024 x 300 float32 is ~1.2MB
+QUERY_CACHE_SIZE=1024
+
+# Below this many files the worker start-up costs more than the parallel tokenizing saves
+PARALLEL_INDEX_MIN_FILES=64
+
+# parse_blog bound to a vocabulary and token cache, set in each pool worker by _init_index_worker
+_worker_parse=None
+
+def _init_index_worker(index_to_key, token_cache_dir=None):
+    """Pool initializer: build the worker's own token -> vector row lookup for parse_blog"""
+    global _worker_parse
+    _worker_parse=partial(parse_blog, vocab={word: i for i, word in enumerate(index_to_key)}, token_cache_dir=token_cache_dir)
+
+def _parse_blog_in_worker(filepath):
+    return _worker_parse(filepath)
+
+def _load_token_ids(token_cache_dir, digest):
+    """Cached vector row ids of the file whose bytes hash to digest, None on a miss"""
+    if token_cache_dir is None:
+        return None
+    try:
+        return np.load(os.path.join(token_cache_dir, digest+'.npy'))
+    except (OSError, ValueError):
+        return None
+
+def _save_token_ids(token_cache_dir, digest, ids):
+    if token_cache_dir is None:
+        return
+    path=os.path.join(token_cache_dir, digest+'.npy')
+    try:
+        # per process temp name, pool workers may write the same content at once
+        with open(f"{path}.{os.getpid()}.tmp", 'wb') as f:
+            np.save(f, np.asarray(ids, dtype=np.int32))
+        os.replace(f"{path}.{os.getpid()}.tmp", path)
+    except OSError as e:
+        logging.warning("Could not cache token ids at %s: %s", path, e)
+
+def _decode_text(data):
+    """utf-8 bytes to str with universal newlines, as text mode would read them"""
+    text=data.decode('utf-8')
+    if '\r' in text:
+        text=text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+def _lookup_ids(text, vocab):
+    """Vector row ids of the in-vocab tokens of text"""
+    return np.array([i for i in map(vocab.get, clean_text(text)) if i is not None], dtype=np.int64)
+
+def parse_blog(filepath, vocab, token_cache_dir=None):
+    """
+    Read, parse and tokenize one blog file. Touches no engine state so it can run in a worker process.
+
+    Args:
+        vocab: token -> vector row dict (the model's key_to_index)
+        token_cache_dir: directory of cached token ids for this vocabulary, None to always tokenize
+
+    Returns:
+        (filename, metadata, vector row ids of the blog's known words), or None if the file can't be indexed
+    """
+    try:
+        # stream the header lines, then read the body in one go; the whole file is never held twice
+        sha1=hashlib.sha1()
+        header_lines=[]
+        body=None
+        with open(filepath, 'rb') as f:
+            for line in f:
+                sha1.update(line)
+                if line.startswith(b'==='):
+                    body=f.read()
+                    sha1.update(body)
+                    break
+                header_lines.append(line)
+        header=_decode_text(b''.join(header_lines))
+        del header_lines
+        if body is None:
+            # no === line (a CR-only file has no lines to find it on): split the whole text like before
+            parts=_HEADER_END_RE.split(header, maxsplit=1)
+            # still none: the whole file is searched for metadata and used as the body
+            header, blog_conent=parts if len(parts)==2 else (header, header)
+        else:
+            blog_conent=_decode_text(body)
+            del body
+
+        # extract metadata from the header
+        metadata={key.lower(): value.strip() for key, value in _HEADER_RE.findall(header)}
+        metadata['content_preview']=blog_conent[:300]+"..." if len(blog_conent) >300 else blog_conent
+
+        # tokenize and look the words up, unless a file with the same bytes was tokenized before
+        digest=sha1.hexdigest()
+        ids=_load_token_ids(token_cache_dir, digest)
+        if ids is None:
+            # title and body separately, joining them would copy the whole body once more
+            ids=np.concatenate((_lookup_ids(metadata.get('title', ''), vocab), _lookup_ids(blog_conent, vocab)))
+            _save_token_ids(token_cache_dir, digest, ids)
+        return os.path.basename(filepath), metadata, ids
+
+    except Exception as e:
+        logging.error("Error indexing %s: %s", filepath, e)
+        return None
+
 class MinimalBlogSearchEngine:
-    def __init__(self,model_path, blog_directory):
+    def __init__(self,model_path, blog_directory, cache_dir='cache', quantize=False, use_simsimd=False):
         logging.info("Loading word embeddings...")
 
         self.model=Word2Vec.load(model_path)
+        self.model_path=model_path
+        # raw lookup table, skips KeyedVectors.__contains__/__getitem__ dispatch per word
+        self._key_to_index=self.model.wv.key_to_index
+        # float32 whatever the model was saved as, so every embedding and the doc matrix stay single precision
+        self._vectors=np.asarray(self.model.wv.vectors, dtype=np.float32)
+        # vocabulary facts served by /suggest and /stats, computed once instead of per request
+        self.vocab_size=len(self.model.wv.key_to_index)
+        self._suggestions=list(islice((word for word in self.model.wv.index_to_key if len(word)>4 and word.isalpha()), 20))
         self.blog_directory=blog_directory
+        self.cache_dir=cache_dir
+        self.quantize=quantize
+        # off by default: BLAS sgemv beats simsimd's float32 cdist on corpora this size
+        self.use_simsimd=use_simsimd
+        if use_simsimd and simsimd is None:
+            logging.warning("use_simsimd=True needs simsimd, scoring with numpy instead")
+        # per instance so cached vectors never outlive (or leak across) the model they came from
+        self._query_embedding_cache=lru_cache(maxsize=QUERY_CACHE_SIZE)(self._embed_query)
 
 
-        # index: word to list of blog files containing that word
+        # index: word to list of blog files containing that word in the title or content preview
         self.word_to_blogs=defaultdict(list)
 
         self.blog_metadata={}
-        self.doc_embeddings={}
-        logging.info("Indexing blog files...")
-        self._index_blogs()
+        # one L2-normalized float32 row per blog, row i belongs to self._filenames[i]
+        self._filenames=[]
+        self._doc_matrix=np.empty((0, self.model.wv.vector_size), dtype=np.float32)
+        # sha1 prefix of the doc matrix (saved in the cache sidecar) and of the one it replaced, keys the ANN index file
+        self._matrix_digest=None
+        self._stale_digest=None
+        hit, cached=self._load_cached_index()
+        if not hit:
+            logging.info("Indexing blog files...")
+            self._index_blogs(cached)
+            self._save_cached_index()
+        self._build_word_index()
+        self._build_quantized_matrix()
+        self._build_ann_index()
         logging.info(f"✅ Indexed {len(self.blog_metadata)} blogs with {len(self.word_to_blogs)} unique words")
-        # logging.info(f"Document embeddings: {(self.doc_embeddings)}")
 
     def _clean_text(self,text):
-        return simple_preprocess(text, min_len=3, max_len=50)
+        return clean_text(text)
 
     def _create_document_emedding(self, words):
         """Create document embedding by averaging word embeddings"""
-        vectors=[]
-        for word in words:
-            if word in self.model.wv:
-                vectors.append(self.model.wv[word])
-        
-        if vectors:
-            return np.mean(vectors, axis=0)
-        else:
-            return np.zeros(self.model.wv.vector_size) #return zero vector if no word found
+        # one C-level dict.get per word, OOV words come back as None (0 is a valid row)
+        return self._embed_ids([i for i in map(self._key_to_index.get, words) if i is not None])
 
-    def _index_blogs(self):
+    def _index_blogs(self, cached=None):
+        """
+        Build the doc matrix from the blog files.
+
+        Args:
+            cached: filename -> (doc matrix row or None, metadata) of files unchanged since the
+                    cached index was written, these are reused instead of parsed and embedded again
+        """
         if not os.path.exists(self.blog_directory):
             logging.error(f"Blog directory not found: {self.blog_directory}")
             return
-        
-        for filename in os.listdir(self.blog_directory):
-            if filename.endswith('.txt'):
-                filepath=os.path.join(self.blog_directory,filename)
-                self._index_single_blog(filepath)
+
+        cached=cached or {}
+        with os.scandir(self.blog_directory) as it:
+            entries=[(entry.name, entry.path) for entry in it if entry.name.endswith('.txt') and entry.is_file()]
+        filenames=[filename for filename, _ in entries]
+        paths=[path for filename, path in entries if filename not in cached]
+        if cached:
+            logging.info(f"Reusing {len(filenames)-len(paths)} cached blogs, indexing {len(paths)} new or changed")
+        parsed={}
+        if paths:
+            token_cache_dir=self._token_cache_dir()
+            processes=os.cpu_count() or 1
+            if processes>1 and len(paths)>=PARALLEL_INDEX_MIN_FILES:
+                # reading and tokenizing is CPU bound, fan it out; embedding stays here next to the model.
+                # Workers build their own lookup from index_to_key, pickled once per worker
+                with multiprocessing.Pool(processes, initializer=_init_index_worker, initargs=(self.model.wv.index_to_key, token_cache_dir)) as pool:
+                    blogs=list(pool.imap(_parse_blog_in_worker, paths, chunksize=8))
+            else:
+                blogs=map(partial(parse_blog, vocab=self._key_to_index, token_cache_dir=token_cache_dir), paths)
+            parsed={blog[0]: blog[1:] for blog in blogs if blog is not None}
+
+        vecs=[]
+        new_rows=[]
+        # walk the directory order so a partial re-index lays rows out like a full one
+        for filename in filenames:
+            if filename in cached:
+                row, metadata=cached[filename]
+            elif filename in parsed:
+                metadata, ids=parsed[filename]
+                # zero vectors (no known words) can never match, so they get no row
+                row=self._embed_ids(ids) if len(ids) else None
+                if row is not None:
+                    new_rows.append(len(vecs))
+            else:
+                continue
+            self.blog_metadata[filename]=metadata
+            if row is not None:
+                self._filenames.append(filename)
+                vecs.append(row)
+
+        if vecs:
+            # stack into one contiguous, 64-byte aligned matrix with unit rows, so a query is scored with a single matvec
+            self._doc_matrix=_aligned_empty((len(vecs), self._vectors.shape[1]), np.float32)
+            np.stack(vecs, out=self._doc_matrix)
+            # row norms in one pass over memory, cached rows are already unit length
+            fresh=self._doc_matrix[new_rows]
+            norms=np.sqrt(np.einsum('ij,ij->i', fresh, fresh))
+            norms[norms==0]=1.0 # word vectors that cancel out exactly: score 0 rather than NaN
+            self._doc_matrix[new_rows]=fresh/norms[:,None]
     
-    def _index_single_blog(self, filepath):
+    def _token_cache_dir(self):
+        """Token id cache directory for this vocabulary (ids are rows of its vector table), None if unusable"""
+        vocab_digest=hashlib.sha1(json.dumps(self.model.wv.index_to_key).encode()).hexdigest()
+        token_cache_dir=os.path.join(self.cache_dir, 'tokens', vocab_digest)
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                content=f.read()
-            
-            # extract metadata
-            lines=content.split('\n')
-            metadata={}
-            content_start=0
-
-            for i, line in enumerate(lines):
-                if line.startswith('Title: '):
-                    metadata['title']=line.replace('Title: ','').strip()
-                elif line.startswith('Author: '):
-                    metadata['author'] = line.replace('Author: ', '').strip()
-                elif line.startswith('Category: '):
-                    metadata['category'] = line.replace('Category: ', '').strip()
-                elif line.startswith('URL: '):
-                    metadata['url'] = line.replace('URL: ', '').strip()
-                elif line.startswith('==='):
-                    content_start = i + 1 #line no. counter to get the content start
-                    break
-            blog_conent='\n'.join(lines[content_start:])
-            metadata['content_preview']=blog_conent[:300]+"..." if len(blog_conent) >300 else blog_conent
+            os.makedirs(token_cache_dir, exist_ok=True)
+        except OSError as e:
+            logging.warning(f"Not caching token ids, could not create {token_cache_dir}: {str(e)}")
+            return None
+        return token_cache_dir
 
-            filename=os.path.basename(filepath)
-            self.blog_metadata[filename]=metadata
+    def _cache_paths(self):
+        """Cache files for this model and blog directory, rewritten in place as blogs change"""
+        key=hashlib.sha1(f"{os.path.abspath(self.model_path)}:{os.path.getmtime(self.model_path)}:{os.path.abspath(self.blog_directory)}".encode()).hexdigest()
+        base=os.path.join(self.cache_dir, key)
+        return base+'.npy', base+'.json'
+
+    def _file_stats(self):
+        """filename -> [mtime, size] of every blog file, a change means the file needs re-indexing"""
+        if not os.path.exists(self.blog_directory):
+            return {}
+        stats={}
+        with os.scandir(self.blog_directory) as it:
+            for entry in it:
+                if entry.name.endswith('.txt') and entry.is_file():
+                    st=entry.stat()
+                    stats[entry.name]=[st.st_mtime, st.st_size]
+        return stats
+
+    def _load_cached_index(self):
+        """
+        Load doc matrix (memory-mapped) and metadata from a previous run.
+
+        Returns:
+            (hit, cached): hit is True when no blog changed; otherwise cached maps the unchanged
+            files to their (row or None, metadata) for _index_blogs to reuse
+        """
+        self._stats=self._file_stats()
+        matrix_path, meta_path=self._cache_paths()
+        if not (os.path.exists(matrix_path) and os.path.exists(meta_path)):
+            return False, None
+
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                sidecar=json.load(f)
+            # mmap: pages are read lazily and shared between worker processes
+            doc_matrix=np.load(matrix_path, mmap_mode='r')
+            if doc_matrix.dtype!=np.float32:
+                raise ValueError(f"expected a float32 matrix, found {doc_matrix.dtype}")
+            files, filenames, blog_metadata=sidecar['files'], sidecar['filenames'], sidecar['metadata']
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable index cache {matrix_path}: {str(e)}")
+            return False, None
+
+        if files==self._stats:
+            self._doc_matrix, self._filenames, self.blog_metadata=doc_matrix, filenames, blog_metadata
+            # hashing the matrix here would page the whole mmap in, the digest was saved with it
+            self._matrix_digest=sidecar.get('digest')
+            logging.info(f"Loaded cached index from {matrix_path}")
+            return True, None
+
+        # the ANN index built from the old matrix is superseded once the new one is saved
+        self._stale_digest=sidecar.get('digest')
+        rows={filename: row for row, filename in enumerate(filenames)}
+        cached={}
+        for filename, stat in files.items():
+            if self._stats.get(filename)==stat and filename in blog_metadata:
+                row=rows.get(filename)
+                cached[filename]=(None if row is None else np.array(doc_matrix[row]), blog_metadata[filename])
+        return False, cached
 
-            # tokenize and index words
-            all_text=f"{metadata.get('title', '')} {blog_conent}"
-            words=self._clean_text(all_text)
-            doc_embedding=self._create_document_emedding(words)
+    def _save_cached_index(self):
+        matrix_path, meta_path=self._cache_paths()
+        self._matrix_digest=self._digest_matrix()
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # write to temp files first so a crash never leaves a half written cache behind
+            with open(matrix_path+'.tmp', 'wb') as f:
+                np.save(f, self._doc_matrix)
+            with open(meta_path+'.tmp', 'w', encoding='utf-8') as f:
+                json.dump({'files': self._stats, 'filenames': self._filenames, 'metadata': self.blog_metadata, 'digest': self._matrix_digest}, f)
+            os.replace(matrix_path+'.tmp', matrix_path)
+            os.replace(meta_path+'.tmp', meta_path)
+        except Exception as e:
+            logging.warning(f"Could not save index cache to {matrix_path}: {str(e)}")
+
+    def _build_word_index(self):
+        """Inverted index and lowercased haystacks over the text the fallback search looks at, in blog_metadata order"""
+        # query words never contain spaces, so joining title and preview creates no false matches
+        self._haystacks={blog_file: f"{metadata.get('title', '')} {metadata.get('content_preview', '')}".lower()
+                         for blog_file, metadata in self.blog_metadata.items()}
+        for blog_file, haystack in self._haystacks.items():
+            for word in set(self._clean_text(haystack)):
+                self.word_to_blogs[word].append(blog_file)
+
+    def _build_quantized_matrix(self):
+        """Optional int8 copy of the doc matrix (per-row scale) for simsimd's int8 dot kernels"""
+        self._doc_matrix_i8=None
+        if not self.quantize or not len(self._filenames):
+            return
+        if simsimd is None:
+            logging.warning("quantize=True needs simsimd, scoring with the float32 matrix instead")
+            return
+
+        self._doc_matrix_i8, self._doc_scale_inv=self._quantize_rows(self._doc_matrix)
 
-            # store the document embeddings
-            self.doc_embeddings[filename]=doc_embedding
+    @staticmethod
+    def _quantize_rows(mat):
+        """Symmetric int8 quantization of each row, returns (int8 rows, 1/scale per row)"""
+        scale=127/np.abs(mat).max(axis=1, keepdims=True)
+        return np.round(mat*scale).astype(np.int8), (1/scale[:,0]).astype(np.float32)
+
+    def _digest_matrix(self):
+        """Short sha1 of the doc matrix, hashed straight from its buffer without a tobytes() copy"""
+        return hashlib.sha1(np.ascontiguousarray(self._doc_matrix)).hexdigest()[:16]
+
+    def _build_ann_index(self):
+        """Build (or load from disk) an HNSW index over the doc matrix for large corpora, with faiss or hnswlib"""
+        self.index=None
+        if len(self._filenames)<ANN_MIN_DOCS:
+            return
+        if faiss is None and hnswlib is None:
+            return
+
+        # the index file is keyed by the exact vectors it was built from
+        digest=self._matrix_digest or self._digest_matrix()
+        index_path=os.path.join(self.cache_dir, f"hnsw-{digest}.faiss" if faiss is not None else f"hnsw-{digest}.hnswlib")
+        num_docs, dim=self._doc_matrix.shape
+        if os.path.exists(index_path):
+            logging.info(f"Loading ANN index from {index_path}")
+            if faiss is not None:
+                self.index=faiss.read_index(index_path)
+            else:
+                self.index=hnswlib.Index(space='ip', dim=dim)
+                self.index.load_index(index_path, max_elements=num_docs)
+            return
 
+        logging.info("Building ANN index...")
+        if faiss is not None:
+            self.index=faiss.IndexHNSWFlat(dim, 32, faiss.METRIC_INNER_PRODUCT)
+            self.index.hnsw.efConstruction=80
+            self.index.add(self._doc_matrix)
+        else:
+            # rows are unit length, so inner product space ranks like cosine without re-normalizing
+            self.index=hnswlib.Index(space='ip', dim=dim)
+            self.index.init_index(max_elements=num_docs, ef_construction=200, M=16)
+            self.index.add_items(self._doc_matrix, np.arange(num_docs))
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            if faiss is not None:
+                faiss.write_index(self.index, index_path)
+            else:
+                self.index.save_index(index_path)
         except Exception as e:
-            logging.error(f"Error indexing {filepath}: {str(e)}")
+            logging.warning(f"Could not save ANN index to {index_path}: {str(e)}")
+            return
 
+        # drop the index of the matrix this one replaces, each is as large as the corpus
+        if self._stale_digest and self._stale_digest!=digest:
+            for ext in ('faiss', 'hnswlib'):
+                stale_path=os.path.join(self.cache_dir, f"hnsw-{self._stale_digest}.{ext}")
+                if os.path.exists(stale_path):
+                    os.remove(stale_path)
+
+    def _embed_ids(self, idx):
+        """Mean of the word vectors at row ids idx, gathered from the vector table in one fancy-index"""
+        if not len(idx):
+            return np.zeros(self._vectors.shape[1], dtype=np.float32) #return zero vector if no word found
+        return self._vectors[np.asarray(idx, dtype=np.int64)].mean(axis=0, dtype=np.float32)
 
     def _get_query_embeddings(self, query):
-        query_words=self._clean_text(query)
-        return self._create_document_emedding(query_words)
+        """Query embedding, repeated queries are served from the per-engine LRU cache"""
+        return self._query_embedding_cache(' '.join(query.lower().split()))
+
+    def _embed_query(self, query):
+        embedding=self._create_document_emedding(self._clean_text(query))
+        embedding.setflags(write=False) # shared by every later hit of the cache
+        return embedding
     
+    def _normalize_query(self, query_embedding):
+        """Unit length float32 query vector, or None for a zero vector"""
+        query_norm=_l2(query_embedding)
+        if query_norm==0:
+            return None #for a zero vector, no similar docs found
+        # float32 like the doc matrix, a float64 operand would turn the sgemv into a dgemv over a promoted copy
+        return (query_embedding/query_norm).astype(np.float32, copy=False)
+
     def _compute_similarities(self, query_embedding):
-        similarities={}
+        """Cosine similarity of the query against every row of the doc matrix"""
+        normalized_query=self._normalize_query(query_embedding)
+        if normalized_query is None:
+            return np.empty(0, dtype=np.float32)
+
+        if self._doc_matrix_i8 is not None:
+            q_i8, q_scale_inv=self._quantize_rows(normalized_query.reshape(1,-1))
+            dots=np.asarray(simsimd.cdist(q_i8, self._doc_matrix_i8, metric="dot"), dtype=np.float32)[0]
+            return dots*self._doc_scale_inv*q_scale_inv[0]
+        if self.use_simsimd and simsimd is not None and len(self._filenames):
+            # rows are unit length, so the dot product is the cosine similarity
+            return np.asarray(simsimd.cdist(normalized_query.reshape(1,-1), self._doc_matrix, metric="dot"), dtype=np.float32)[0]
+        return self._doc_matrix @ normalized_query
+
+    def _ann_search(self, query_embedding, k):
+        """Approximate top k (doc indices, scores) from the HNSW index"""
+        normalized_query=self._normalize_query(query_embedding)
+        if normalized_query is None:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        return self._ann_query(normalized_query.reshape(1,-1), k)[0]
+
+    def _ann_query(self, query_matrix, k):
+        """Approximate top k of each unit query row, a list of (doc indices, scores) pairs"""
+        ef=max(128, k)
+        if faiss is not None:
+            params=faiss.SearchParametersHNSW(efSearch=ef)
+            all_scores, all_ids=self.index.search(query_matrix, k, params=params)
+            # faiss pads with -1 when fewer than k neighbours are reachable
+            return [(ids[ids>=0], scores[ids>=0]) for scores, ids in zip(all_scores, all_ids)]
+
+        self.index.set_ef(ef)
+        labels, distances=self.index.knn_query(query_matrix, k=k)
+        # hnswlib's inner product distance is 1 - dot
+        return [(ids.astype(np.int64), 1-dists) for ids, dists in zip(labels, distances)]
 
-        query_norm=np.linalg.norm(query_embedding)
-        if query_norm==0:
-            return similarities #for a zero vector, no similar docs found
-        
-        normalized_query=query_embedding/query_norm
-        # compute similarity with each documents
-        for filename, doc_embedding in self.doc_embeddings.items():
-            doc_norm=np.linalg.norm(doc_embedding)
-            if doc_norm>0:
-                normalized_doc=doc_embedding/doc_norm
-                # cosine similarity
-                similarity=np.dot(normalized_query, normalized_doc)
-                similarities[filename]=similarity
-
-        return similarities
     def search(self, query, top_k=5):
         """
        Search for blogs using pure embedding based similarity
@@ -126,55 +503,122 @@ class MinimalBlogSearchEngine:
         query=query.lower().strip()
         if not query:
             return self._fallback_search(query,top_k)
-        logging.info(f" Searching for: '{query}")
+        logging.info("Searching for: '%s'", query)
 
         query_embedding=self._get_query_embeddings(query)
+        if not query_embedding.any():
+            return self._fallback_search(query,top_k) # no query word is in the vocabulary
 
-        # compute similarities with all documents
-        similarities=self._compute_similarities(query_embedding)
-        logging.info(f"The similarities are : {similarities.keys()}")
-
-        if not similarities:
+        k=min(top_k, len(self._filenames))
+        if k<=0:
             return []
-        
-        sorted_results=sorted(similarities.items(), key=lambda x: x[1], reverse=True)
 
-        results=[]
-        for filename, score in sorted_results[:top_k]:
-            metadata=self.blog_metadata.get(filename, {})
-            results.append((filename, score, metadata))
+        if self.index is not None:
+            top, scores=self._ann_search(query_embedding, k)
+        else:
+            # compute similarities with all documents
+            similarities=self._compute_similarities(query_embedding)
+            logging.debug("similarity count: %d", similarities.size)
+            if not similarities.size:
+                return []
+
+            top=self._top_k(similarities, k)
+            scores=similarities[top]
+
+        return self._format_results(top, scores)
+
+    def batch_search(self, queries, top_k=5):
+        """
+        Search several queries at once, all of them are scored with a single matrix-matrix product
+
+        Args:
+            queries: List of search terms
+            top_k: Number of results to return per query
+
+        Returns:
+            List with one search() style result list per query, in the same order
+        """
+        queries=[query.lower().strip() for query in queries]
+        results=[[] for _ in queries]
+        k=min(top_k, len(self._filenames))
+
+        # empty queries and queries with no known word go to the text fallback, like in search()
+        rows, batch=[], []
+        for row, query in enumerate(queries):
+            normalized_query=self._normalize_query(self._get_query_embeddings(query)) if query else None
+            if normalized_query is None:
+                results[row]=self._fallback_search(query, top_k)
+                continue
+            rows.append(row)
+            batch.append(normalized_query)
+        if not batch or k<=0:
+            return results
+
+        query_matrix=np.vstack(batch)
+        if self.index is not None:
+            for row, (ids, scores) in zip(rows, self._ann_query(query_matrix, k)):
+                results[row]=self._format_results(ids, scores)
+            return results
+
+        similarities=query_matrix @ self._doc_matrix.T # (queries, docs) in one sgemm
+        for row, row_scores in zip(rows, similarities):
+            top=self._top_k(row_scores, k)
+            results[row]=self._format_results(top, row_scores[top])
         return results
 
+    @staticmethod
+    def _top_k(scores, k):
+        """Indices of the k highest scores, best first. Partial sort: only those k get ordered"""
+        if k>=scores.size:
+            return np.argsort(-scores)
+        top=np.argpartition(-scores, k-1)[:k]
+        return top[np.argsort(-scores[top])]
+
+    def _format_results(self, top, scores):
+        return [(self._filenames[i], float(score), self.blog_metadata.get(self._filenames[i], {}))
+                for i, score in zip(top.tolist(), scores.tolist())]
+
     def _fallback_search(self, query, top_k):
         """
             Fallback search when the query word in not in vocabulary
         """
-        logging.info(f"'{query}' not found in embeddings. Trying text-based search...")
+        logging.info("'%s' not found in embeddings. Trying text-based search...", query)
 
-        # simple string matching fallback
-        matching_blogs=[]
         query_words=set(self._clean_text(query))
+        if not query_words or top_k<=0:
+            return []
 
-        for blog_file, metadata in self.blog_metadata.items():
-            title=metadata.get('title', '').lower()
-            content=metadata.get('content_preview', '').lower()
-            
+        # blogs containing a query word as a whole word, straight from the inverted index
+        exact=set().union(*(self.word_to_blogs.get(word, ()) for word in query_words))
+        matching_blogs=[(blog_file, 0.5, metadata) for blog_file, metadata in self.blog_metadata.items() if blog_file in exact][:top_k]
+        if len(matching_blogs)>=top_k:
+            return matching_blogs
+
+        # then simple string matching for words that only appear inside longer words
+        for blog_file, haystack in self._haystacks.items():
             # check if any query words appear in title or content preview
-            if any(word in title.lower() or word in content.lower() for word in query_words):
-                matching_blogs.append((blog_file, 0.5, metadata))
+            if blog_file not in exact and any(word in haystack for word in query_words):
+                matching_blogs.append((blog_file, 0.5, self.blog_metadata[blog_file]))
+                if len(matching_blogs)==top_k:
+                    break
         
-        return matching_blogs[:top_k]
+        return matching_blogs
     
     def get_stats(self):
         return {
-            'total_blogs':len(self.doc_embeddings),
-            'vocabulary_size':len(self.model.wv.key_to_index),
+            'total_blogs':len(self.blog_metadata),
+            # blogs with at least one in-vocabulary word, i.e. rows of the doc matrix
+            'embedded_blogs':len(self._filenames),
+            'vocabulary_size':self.vocab_size,
             'embedding_dimension':self.model.wv.vector_size
         }
     def get_vocabulary_sample(self, n=20):
         """Get a sample of words from the vocabulary for testing"""
-        vocab = list(self.model.wv.key_to_index.keys())
-        return vocab[:n]
+        return self.model.wv.index_to_key[:n]
+
+    def get_suggestions(self):
+        """Most frequent meaningful words (longer than 4 letters, alphabetic) to offer as queries"""
+        return list(self._suggestions)
     
     def search_interactive(self):
         """Interactive search interface"""
@@ -227,9 +671,9 @@ if __name__=="__main__":
     demo_queries = ["technology", "data", "glific", "artificial intelligence", "development"]
     
     print("\n🔍 Demo searches:")
-    for query in demo_queries:
+    # all demo queries are scored together in one matrix-matrix product
+    for query, results in zip(demo_queries, search_engine.batch_search(demo_queries, top_k=3)):
         print(f"\nSearching for: '{query}'")
-        results = search_engine.search(query, top_k=3)
         
         if results:
             for i, (blog_file, score, metadata) in enumerate(results,1):